@@ -1,22 +1,153 @@
-import json
-from os.path import join as path_join
+from pathlib import Path
 
 import numpy as np
+import orjson
 import xarray as xr
 from pytest import fixture
 from tifffile import imwrite
 
+# Reference hash files, containing expected hashes for the sample test files.
+FIXTURES_DIRECTORY = Path(__file__).parent / 'fixtures'
+SAMPLE_HASH_FILE = FIXTURES_DIRECTORY / 'sample_datatree_hashes.json'
+SAMPLE_GEOTIFF_HASH_FILE = FIXTURES_DIRECTORY / 'sample_geotiff_hash.json'
+
+
+def read_only_array(array_values: list, dtype=None) -> np.ndarray:
+    """Create a numpy array that cannot be altered by any test."""
+    read_only = np.array(array_values, dtype=dtype)
+    read_only.flags.writeable = False
+    return read_only
+
+
+# Array values for sample_datatree, created once for the whole test suite.
+LONGITUDE_DATA = read_only_array([10, 15, 20])
+LATITUDE_DATA = read_only_array([25, 30])
+
+VARIABLE_DATA = read_only_array([[1, 2, 3], [4, 5, 6]])
+TRANSPOSE_VARIABLE_DATA = read_only_array([[1, 4], [2, 5], [3, 6]])
+ALTERNATIVE_VARIABLE_DATA = read_only_array([[1, 2, 3], [4, 5, 7]])
+
+# Array and `tifffile.imwrite` options for GeoTIFF files written by tests.
+# Explicit options skip the dtype inference and option detection in tifffile.
+SAMPLE_GEOTIFF_ARRAY = read_only_array([[1, 2], [3, 4]], dtype=np.int64)
+GEOTIFF_WRITE_OPTIONS = {
+    'photometric': 'minisblack',
+    'compression': None,
+    'predictor': False,
+    'metadata': None,
+}
+
+# Tags for the sample GeoTIFF file, as a tuple so they cannot be altered.
+SAMPLE_GEOTIFF_TAGS = (
+    (
+        34735,
+        3,
+        32,
+        (
+            1,
+            1,
+            0,
+            7,
+            1024,
+            0,
+            1,
+            1,
+            1025,
+            0,
+            1,
+            1,
+            1026,
+            34737,
+            36,
+            0,
+            2049,
+            34737,
+            7,
+            36,
+            2054,
+            0,
+            1,
+            9102,
+            3072,
+            0,
+            1,
+            6933,
+            3076,
+            0,
+            1,
+            9001,
+        ),
+        True,
+    ),
+    (33550, 12, 3, (36032.22084058401, 36032.220840584, 0.0), True),
+    (33922, 12, 6, (0.0, 0.0, 0.0, -17367530.4451615, 7314540.8306386, 0.0), True),
+    (34737, 2, 44, 'WGS 84 / NSIDC EASE-Grid 2.0 Global|WGS 84|', True),
+    (
+        42112,
+        2,
+        845,
+        (
+            '<GDALMetadata>\n'
+            '  <Item name="long_name">The fraction of the grid cell that '
+            '  contains the most common land cover in that area based on '
+            '  the IGBP landcover map.</Item>\n'
+            '  <Item name="OVR_RESAMPLING_ALG">NEAREST</Item>'
+            '  <Item name="valid_max">1.0</Item>'
+            '  <Item name="valid_min">0.0</Item>'
+            '  <Item name="DESCRIPTION" sample="0" role="description">'
+            '  The fraction of the grid cell that contains the most '
+            '  common land cover in that area based on the IGBP '
+            '  landcover map.</Item>'
+            '  <Item name="DESCRIPTION" sample="1" role="description">'
+            '  The fraction of the grid cell that contains the most '
+            '  common land cover in that area based on the IGBP '
+            '  landcover map.</Item>'
+            '  <Item name="DESCRIPTION" sample="2" role="description">'
+            '  The fraction of the grid cell that contains the most '
+            '  common land cover in that area based on the IGBP '
+            '  landcover map.</Item>'
+            '</GDALMetadata>'
+        ),
+        True,
+    ),
+    (42113, 2, 6, '-9999', True),
+)
+
+
+# Types that the standard library `json` module can serialise.
+JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
 
 def is_json_serialisable(input_object) -> bool:
-    """Return if object can be serialised to a JSON object."""
-    try:
-        json.dumps(input_object)
+    """Return if object can be serialised to a JSON object.
+
+    This checks types recursively, returning at the first unsupported type,
+    instead of serialising the whole object with `json.dumps`. As with `json`,
+    dictionary keys can be any scalar type, as they are converted to strings.
+
+    """
+    if isinstance(input_object, JSON_SCALAR_TYPES):
         return True
-    except (TypeError, OverflowError):
-        return False
 
+    if isinstance(input_object, list | tuple):
+        return all(is_json_serialisable(element) for element in input_object)
+
+    if isinstance(input_object, dict):
+        return all(
+            isinstance(key, JSON_SCALAR_TYPES) and is_json_serialisable(value)
+            for key, value in input_object.items()
+        )
+
+    return False
 
-@fixture(scope='function')
+
+@fixture(scope='session')
+def shared_directory(tmp_path_factory) -> Path:
+    """Temporary directory for all test files written once per test session."""
+    return tmp_path_factory.mktemp('shared', numbered=False)
+
+
+@fixture(scope='session')
 def latitude_metadata():
     """Sample metadata dictionary."""
     return {
@@ -25,93 +156,43 @@ def latitude_metadata():
     }
 
 
-@fixture()
+@fixture(scope='session')
 def latitude_metadata_bytes():
     """Bytes value of latitude metadata dictionary."""
     return b'{"standard_name": "latitude", "units": "degrees_north"}'
 
 
-@fixture()
-def group_one_hashes():
-    """Hashed values for group_one in sample_datatree."""
-    return {
-        '/group_one': (
-            '5f54ee382e9afdb41c15107d46cb10e3011fa12fd02f1890b91d2b0d7a729bea'
-        ),
-        '/group_one/science_variable': (
-            'b0777a5ad3b5763b7c0170f2e21dfd7ceb37f9e974275e97b70d0e72140bf809'
-        ),
-        '/group_one/transpose_variable': (
-            'c085b0a064fa61b9ffef1cd638c0f6ed65f93095f17d79661b8cbf8e6e8a808a'
-        ),
-        '/group_one/different_attributes_variable': (
-            'b37c8755cf6f2b4ceae42c4c0ff158920278a8d48c7d654df24b6b2fbe86b595'
-        ),
-        '/group_one/different_element_variable': (
-            'b6decc7257988c18958811fbb09269f4f2aeee5f8aa43cdb000de24d850e096d'
-        ),
-        '/group_one/identical_variable': (
-            'b0777a5ad3b5763b7c0170f2e21dfd7ceb37f9e974275e97b70d0e72140bf809'
-        ),
-        '/group_one/lat': (
-            'da9f1b6a68e46c8a4f0c19efdb136e70cfdcb84b38668a9cad36766ab6137d6d'
-        ),
-        '/group_one/lon': (
-            'b1a2d2ef250d759a33bf3948ca1c5c6dbe63c875f7e13bad3b4c611f7521661b'
-        ),
-    }
-
-
-@fixture
-def group_two_hashes():
-    """Hashed values for group_two in sample_datatree."""
-    return {
-        '/group_two': (
-            '5f54ee382e9afdb41c15107d46cb10e3011fa12fd02f1890b91d2b0d7a729bea'
-        ),
-        '/group_two/science_variable': (
-            'b0777a5ad3b5763b7c0170f2e21dfd7ceb37f9e974275e97b70d0e72140bf809'
-        ),
-        '/group_two/lon': (
-            'b1a2d2ef250d759a33bf3948ca1c5c6dbe63c875f7e13bad3b4c611f7521661b'
-        ),
-        '/group_two/lat': (
-            'da9f1b6a68e46c8a4f0c19efdb136e70cfdcb84b38668a9cad36766ab6137d6d'
-        ),
-    }
+@fixture(scope='session')
+def sample_datatree_hashes():
+    """Hashed values for all of sample_datatree."""
+    return orjson.loads(SAMPLE_HASH_FILE.read_bytes())
 
 
-@fixture()
-def sample_datatree_hashes(group_one_hashes, group_two_hashes):
-    """Hashed values for all of sample_datatree."""
+@fixture(scope='session')
+def group_one_hashes(sample_datatree_hashes):
+    """Hashed values for group_one in sample_datatree."""
     return {
-        '/': '7b7a2f342b4a9bebe67c025f7e5efa95710ae31bd98cbe7c1728ffeaad3ff742',
-        **group_one_hashes,
-        **group_two_hashes,
+        hashed_path: hash_value
+        for hashed_path, hash_value in sample_datatree_hashes.items()
+        if hashed_path == '/group_one' or hashed_path.startswith('/group_one/')
     }
 
 
-@fixture()
-def sample_hash_file(tmpdir, sample_datatree_hashes):
-    """Output JSON file containing reference hashes."""
-    hash_file_path = path_join(tmpdir, 'hashed_reference_file.json')
-
-    with open(hash_file_path, 'w', encoding='utf-8') as file_handler:
-        json.dump(sample_datatree_hashes, file_handler, indent=2)
+@fixture(scope='session')
+def sample_hash_file():
+    """JSON file containing reference hashes for sample_datatree."""
+    return str(SAMPLE_HASH_FILE)
 
-    return hash_file_path
 
-
-@fixture(scope='function')
+@fixture(scope='session')
 def sample_datatree():
-    """xarray.DataTree object to be used for tests."""
-    longitude_data = np.array([10, 15, 20])
-    latitude_data = np.array([25, 30])
+    """xarray.DataTree object to be used for tests.
 
-    variable_data = np.array([[1, 2, 3], [4, 5, 6]])
-    transpose_variable_data = np.array([[1, 4], [2, 5], [3, 6]])
-    alternative_variable_data = np.array([[1, 2, 3], [4, 5, 7]])
+    This object is shared between all tests, so it must not be mutated. Tests
+    that need to alter the tree should use a copy instead. The array values are
+    read-only, so a shallow copy is sufficient to alter metadata attributes.
 
+    """
     variable_attributes = {'unit': 'amazing science unit'}
     alternative_variable_attributes = {'unit': 'different science unit'}
 
@@ -127,33 +208,33 @@ def sample_datatree():
         {
             'science_variable': (
                 ('lat', 'lon'),
-                variable_data,
+                VARIABLE_DATA,
                 variable_attributes,
             ),
             'transpose_variable': (
                 ('lon', 'lat'),
-                transpose_variable_data,
+                TRANSPOSE_VARIABLE_DATA,
                 variable_attributes,
             ),
             'different_attributes_variable': (
                 ('lat', 'lon'),
-                variable_data,
+                VARIABLE_DATA,
                 alternative_variable_attributes,
             ),
             'different_element_variable': (
                 ('lat', 'lon'),
-                alternative_variable_data,
+                ALTERNATIVE_VARIABLE_DATA,
                 variable_attributes,
             ),
             'identical_variable': (
                 ('lat', 'lon'),
-                variable_data,
+                VARIABLE_DATA,
                 variable_attributes,
             ),
         },
         coords={
-            'lat': latitude_data,
-            'lon': longitude_data,
+            'lat': LATITUDE_DATA,
+            'lon': LONGITUDE_DATA,
         },
         attrs={'group_attributes': 'attribute_value'},
     )
@@ -164,13 +245,13 @@ def sample_datatree():
         {
             'science_variable': (
                 ('lat', 'lon'),
-                variable_data,
+                VARIABLE_DATA,
                 variable_attributes,
             ),
         },
         coords={
-            'lon': longitude_data,
-            'lat': latitude_data,
+            'lon': LONGITUDE_DATA,
+            'lat': LATITUDE_DATA,
         },
         attrs={'group_attributes': 'attribute_value'},
     )
@@ -178,137 +259,93 @@ def sample_datatree():
     return sample_datatree
 
 
-@fixture(scope='function')
-def sample_h5_file(sample_datatree, tmpdir):
+@fixture(scope='session')
+def amended_variable_nc4_file(sample_datatree, shared_directory):
+    """sample_datatree, with an extra metadata attribute on a variable.
+
+    The amended variable resolves to a different hash value than that in the
+    reference hash file. A shallow copy of sample_datatree is amended, so the
+    shared sample_datatree is unchanged.
+
+    """
+    amended_datatree = sample_datatree.copy(deep=False)
+    amended_datatree['/group_one/science_variable'].attrs['extra attribute'] = 'EXTRA!'
+    amended_file_path = f'{shared_directory}/amended_variable.nc4'
+    amended_datatree.to_netcdf(amended_file_path)
+    return amended_file_path
+
+
+@fixture(scope='session')
+def amended_group_metadata_nc4_file(sample_datatree, shared_directory):
+    """sample_datatree, with an extra metadata attribute on a group.
+
+    The amended group resolves to a different hash value than that in the
+    reference hash file. A shallow copy of sample_datatree is amended, so the
+    shared sample_datatree is unchanged.
+
+    """
+    amended_datatree = sample_datatree.copy(deep=False)
+    amended_datatree['/group_one'].attrs['IGNORE_ME'] = 'Bad metadata!'
+    amended_file_path = f'{shared_directory}/amended_group_metadata.nc4'
+    amended_datatree.to_netcdf(amended_file_path)
+    return amended_file_path
+
+
+@fixture(scope='session')
+def sample_h5_file(sample_datatree, shared_directory):
     """xarray.DataTree object written out to disk as HDF-5 for testing.
 
     Strictly speaking, the output is using `xarray.DataTree.to_netcdf`.
 
     """
-    sample_file_path = path_join(tmpdir, 'sample_file.h5')
+    sample_file_path = f'{shared_directory}/sample_file.h5'
     sample_datatree.to_netcdf(sample_file_path)
     return sample_file_path
 
 
-@fixture(scope='function')
-def sample_nc4_file(sample_datatree, tmpdir):
+@fixture(scope='session')
+def sample_nc4_file(sample_datatree, shared_directory):
     """xarray.DataTree object written out to disk as netCDF4 for testing."""
-    sample_file_path = path_join(tmpdir, 'sample_file.nc4')
+    sample_file_path = f'{shared_directory}/sample_file.nc4'
     sample_datatree.to_netcdf(sample_file_path)
     return sample_file_path
 
 
-@fixture(scope='function')
+@fixture(scope='session')
 def sample_geotiff_tags():
-    """Tags for the sample GeoTIFF file."""
-    return [
-        (
-            34735,
-            3,
-            32,
-            (
-                1,
-                1,
-                0,
-                7,
-                1024,
-                0,
-                1,
-                1,
-                1025,
-                0,
-                1,
-                1,
-                1026,
-                34737,
-                36,
-                0,
-                2049,
-                34737,
-                7,
-                36,
-                2054,
-                0,
-                1,
-                9102,
-                3072,
-                0,
-                1,
-                6933,
-                3076,
-                0,
-                1,
-                9001,
-            ),
-            True,
-        ),
-        (33550, 12, 3, (36032.22084058401, 36032.220840584, 0.0), True),
-        (33922, 12, 6, (0.0, 0.0, 0.0, -17367530.4451615, 7314540.8306386, 0.0), True),
-        (34737, 2, 44, 'WGS 84 / NSIDC EASE-Grid 2.0 Global|WGS 84|', True),
-        (
-            42112,
-            2,
-            845,
-            (
-                '<GDALMetadata>\n'
-                '  <Item name="long_name">The fraction of the grid cell that '
-                '  contains the most common land cover in that area based on '
-                '  the IGBP landcover map.</Item>\n'
-                '  <Item name="OVR_RESAMPLING_ALG">NEAREST</Item>'
-                '  <Item name="valid_max">1.0</Item>'
-                '  <Item name="valid_min">0.0</Item>'
-                '  <Item name="DESCRIPTION" sample="0" role="description">'
-                '  The fraction of the grid cell that contains the most '
-                '  common land cover in that area based on the IGBP '
-                '  landcover map.</Item>'
-                '  <Item name="DESCRIPTION" sample="1" role="description">'
-                '  The fraction of the grid cell that contains the most '
-                '  common land cover in that area based on the IGBP '
-                '  landcover map.</Item>'
-                '  <Item name="DESCRIPTION" sample="2" role="description">'
-                '  The fraction of the grid cell that contains the most '
-                '  common land cover in that area based on the IGBP '
-                '  landcover map.</Item>'
-                '</GDALMetadata>'
-            ),
-            True,
-        ),
-        (42113, 2, 6, '-9999', True),
-    ]
+    """Tags for the sample GeoTIFF file.
 
+    This tuple is shared between all tests, so tests that need to alter the
+    tags should make a list copy first.
 
-@fixture(scope='function')
-def sample_geotiff_file(tmpdir, sample_geotiff_tags):
+    """
+    return SAMPLE_GEOTIFF_TAGS
+
+
+@fixture(scope='session')
+def sample_geotiff_file(shared_directory, sample_geotiff_tags):
     """GeoTIFF object written out to disk.
 
     Values copied from a PREFIRE GeoTIFF.
 
     """
-    geotiff_path = path_join(tmpdir, 'sample_file.tif')
+    geotiff_path = f'{shared_directory}/sample_file.tif'
     imwrite(
         geotiff_path,
-        np.array([[1, 2], [3, 4]]),
+        SAMPLE_GEOTIFF_ARRAY,
         extratags=sample_geotiff_tags,
+        **GEOTIFF_WRITE_OPTIONS,
     )
     return geotiff_path
 
 
-@fixture()
+@fixture(scope='session')
 def sample_geotiff_hash():
     """Hashed value for sample GeoTIFF file."""
-    return {
-        'geotiff_hash': (
-            '450c6cdad0419431dc9d2dc80ad374f8627632302ae5fd0b7354aae160ff528e'
-        )
-    }
-
-
-@fixture()
-def sample_geotiff_hash_file(sample_geotiff_hash, tmpdir):
-    """Output JSON file containing reference hash for GeoTIFF sample file."""
-    hash_file_path = path_join(tmpdir, 'hashed_reference_file.json')
+    return orjson.loads(SAMPLE_GEOTIFF_HASH_FILE.read_bytes())
 
-    with open(hash_file_path, 'w', encoding='utf-8') as file_handler:
-        json.dump(sample_geotiff_hash, file_handler, indent=2)
 
-    return hash_file_path
+@fixture(scope='session')
+def sample_geotiff_hash_file():
+    """JSON file containing reference hash for GeoTIFF sample file."""
+    return str(SAMPLE_GEOTIFF_HASH_FILE)
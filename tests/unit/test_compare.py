@@ -1,7 +1,6 @@
 """Unit tests for the earthdata_hashdiff.compare.py module."""
 
-from os.path import join as path_join
-from unittest.mock import patch
+from unittest.mock import DEFAULT, patch
 
 import numpy as np
 import pytest
@@ -15,6 +14,14 @@ from earthdata_hashdiff.compare import (
     matches_reference_hash_file_using_xarray,
     nc4_matches_reference_hash_file,
 )
+from tests.conftest import (
+    GEOTIFF_WRITE_OPTIONS,
+    SAMPLE_GEOTIFF_ARRAY,
+    read_only_array,
+)
+
+# Differs from SAMPLE_GEOTIFF_ARRAY by a single element.
+AMENDED_GEOTIFF_ARRAY = read_only_array([[1, 2], [3, 5]], dtype=np.int64)
 
 
 def test_matches_reference_hash_file_using_xarray(sample_nc4_file, sample_hash_file):
@@ -22,79 +29,54 @@ def test_matches_reference_hash_file_using_xarray(sample_nc4_file, sample_hash_f
     assert matches_reference_hash_file_using_xarray(sample_nc4_file, sample_hash_file)
 
 
-def test_matches_reference_hash_file_skip_variable(
-    sample_datatree, tmpdir, sample_hash_file
-):
-    """Ensure a specified variable is ignored in comparison.
-
-    One of the variables in the sample xarray.DataTree fixture will be updated
-    such that it should fail validation. Then the comparison function will be
-    told to ignore that variable during the comparison.
-
-    """
-    amended_datatree_path = path_join(tmpdir, 'amended_datatree.nc4')
-    sample_datatree['/group_one/science_variable'].attrs['extra attribute'] = 'EXTRA!'
-    sample_datatree.to_netcdf(amended_datatree_path)
-
-    assert matches_reference_hash_file_using_xarray(
-        amended_datatree_path,
-        sample_hash_file,
-        skipped_variables_or_groups={'/group_one/science_variable'},
-    )
-
-
-def test_matches_reference_hash_file_updated_variable_asserts_false(
-    sample_datatree, tmpdir, sample_hash_file
-):
-    """Ensure that when a variable is changed, comparisons return False.
-
-    This test shows that an amended, but non-skipped, variable will be detected
-    as different by the comparison functions, because the variable itself
-    resolves to a different hash value.
-
-    """
-    amended_datatree_path = path_join(tmpdir, 'amended_datatree.nc4')
-    sample_datatree['/group_one/science_variable'].attrs['extra attribute'] = 'EXTRA!'
-    sample_datatree.to_netcdf(amended_datatree_path)
-
-    assert not matches_reference_hash_file_using_xarray(
-        amended_datatree_path,
-        sample_hash_file,
-    )
-
-
-def test_matches_reference_hash_file_skip_metadata(
-    sample_datatree, tmpdir, sample_hash_file
-):
-    """Ensure a specified metadata attribute is ignored in comparison."""
-    amended_datatree_path = path_join(tmpdir, 'amended_datatree.nc4')
-    sample_datatree['/group_one'].attrs['IGNORE_ME'] = 'Bad metadata!'
-    sample_datatree.to_netcdf(amended_datatree_path)
-
-    assert matches_reference_hash_file_using_xarray(
-        amended_datatree_path,
-        sample_hash_file,
-        skipped_metadata_attributes={'IGNORE_ME'},
-    )
-
-
-def test_matches_reference_hash_file_updated_metadata_asserts_false(
-    sample_datatree, tmpdir, sample_hash_file
+@pytest.mark.parametrize(
+    'amended_file_fixture,comparison_kwargs,expected_match',
+    [
+        (
+            'amended_variable_nc4_file',
+            {'skipped_variables_or_groups': {'/group_one/science_variable'}},
+            True,
+        ),
+        ('amended_variable_nc4_file', {}, False),
+        (
+            'amended_group_metadata_nc4_file',
+            {'skipped_metadata_attributes': {'IGNORE_ME'}},
+            True,
+        ),
+        ('amended_group_metadata_nc4_file', {}, False),
+    ],
+    ids=[
+        'skip_variable',
+        'updated_variable_asserts_false',
+        'skip_metadata',
+        'updated_metadata_asserts_false',
+    ],
+)
+def test_matches_reference_hash_file_amended_datatree(
+    amended_file_fixture,
+    comparison_kwargs,
+    expected_match,
+    sample_hash_file,
+    request,
 ):
-    """Ensure that when a metadata attribute is changed, comparison is False.
+    """Ensure amended variables and metadata are only ignored when skipped.
 
-    This test shows that an amended, but non-skipped, metadata attribute on a
-    group will be detected as different by the comparison functions, because
-    the group itself resolves to a different hash value.
+    Each amended file has either a variable or a group metadata attribute
+    updated, such that it should fail validation. When the comparison function
+    is told to skip that variable or metadata attribute the comparison passes.
+    When not skipped, the amended variable or group resolves to a different
+    hash value, so the comparison returns False.
 
     """
-    amended_datatree_path = path_join(tmpdir, 'amended_datatree.nc4')
-    sample_datatree['/group_one'].attrs['DONT_IGNORE_ME'] = 'Different metadata!'
-    sample_datatree.to_netcdf(amended_datatree_path)
+    amended_file_path = request.getfixturevalue(amended_file_fixture)
 
-    assert not matches_reference_hash_file_using_xarray(
-        amended_datatree_path,
-        sample_hash_file,
+    assert (
+        matches_reference_hash_file_using_xarray(
+            amended_file_path,
+            sample_hash_file,
+            **comparison_kwargs,
+        )
+        == expected_match
     )
 
 
@@ -118,15 +100,16 @@ def test_geotiff_matches_reference_hash_file(
 
 
 def test_geotiff_matches_reference_hash_file_data_difference_fails(
-    sample_geotiff_tags, tmpdir, sample_geotiff_hash_file
+    sample_geotiff_tags, shared_directory, sample_geotiff_hash_file
 ):
     """Ensure GeoTIFF comparison fails when an array element is different."""
-    amended_geotiff_path = path_join(tmpdir, 'amended_metadata.tif')
+    amended_geotiff_path = f'{shared_directory}/amended_data.tif'
 
     imwrite(
         amended_geotiff_path,
-        np.array([[1, 2], [3, 5]]),
+        AMENDED_GEOTIFF_ARRAY,
         extratags=sample_geotiff_tags,
+        **GEOTIFF_WRITE_OPTIONS,
     )
 
     assert not geotiff_matches_reference_hash_file(
@@ -136,16 +119,18 @@ def test_geotiff_matches_reference_hash_file_data_difference_fails(
 
 
 def test_geotiff_matches_reference_hash_file_metadata_difference_fails(
-    sample_geotiff_tags, tmpdir, sample_geotiff_hash_file
+    sample_geotiff_tags, shared_directory, sample_geotiff_hash_file
 ):
     """Ensure GeoTIFF comparison fails when a metadata attribute is different."""
-    amended_geotiff_path = path_join(tmpdir, 'amended_metadata.tif')
-    sample_geotiff_tags[1] = (33550, 12, 3, (18000, 18000, 0.0), True)
+    amended_geotiff_path = f'{shared_directory}/amended_metadata.tif'
+    amended_geotiff_tags = list(sample_geotiff_tags)
+    amended_geotiff_tags[1] = (33550, 12, 3, (18000, 18000, 0.0), True)
 
     imwrite(
         amended_geotiff_path,
-        np.array([[1, 2], [3, 4]]),
-        extratags=sample_geotiff_tags,
+        SAMPLE_GEOTIFF_ARRAY,
+        extratags=amended_geotiff_tags,
+        **GEOTIFF_WRITE_OPTIONS,
     )
 
     assert not geotiff_matches_reference_hash_file(
@@ -178,107 +163,51 @@ def test_guess_file_type_not_recognised():
         guess_file_type('input.xyz')
 
 
-@patch('earthdata_hashdiff.compare.geotiff_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.h5_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.nc4_matches_reference_hash_file', autospec=True)
-def test_matches_reference_hash_file_netcdf4(
-    mock_nc4_matches_reference_hash_file,
-    mock_h5_matches_reference_hash_file,
-    mock_geotiff_matches_reference_hash_file,
-):
-    """Ensure netCDF4 input is routed to the correct comparison function."""
-    mock_nc4_matches_reference_hash_file.return_value = True
-
-    assert matches_reference_hash_file('input.nc4', 'hashes.json')
-    mock_nc4_matches_reference_hash_file.assert_called_once_with(
-        'input.nc4',
-        'hashes.json',
-    )
-
-    # Ensure other comparison functions weren't called
-    mock_h5_matches_reference_hash_file.assert_not_called()
-    mock_geotiff_matches_reference_hash_file.assert_not_called()
-
-
-@patch('earthdata_hashdiff.compare.geotiff_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.h5_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.nc4_matches_reference_hash_file', autospec=True)
-def test_matches_reference_hash_file_netcdf4_kwargs(
-    mock_nc4_matches_reference_hash_file,
-    mock_h5_matches_reference_hash_file,
-    mock_geotiff_matches_reference_hash_file,
-):
-    """Ensure netCDF4 input is routed to the comparison function with kwargs."""
-    mock_nc4_matches_reference_hash_file.return_value = True
-
-    variables_to_skip = {'variable_one', 'variable_two'}
-
-    assert matches_reference_hash_file(
-        'input.nc4',
-        'hashes.json',
-        skipped_variables_or_groups=variables_to_skip,
-    )
-    mock_nc4_matches_reference_hash_file.assert_called_once_with(
-        'input.nc4',
-        'hashes.json',
-        skipped_variables_or_groups=variables_to_skip,
-    )
-
-    # Ensure other comparison functions weren't called
-    mock_h5_matches_reference_hash_file.assert_not_called()
-    mock_geotiff_matches_reference_hash_file.assert_not_called()
-
-
-@patch('earthdata_hashdiff.compare.geotiff_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.h5_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.nc4_matches_reference_hash_file', autospec=True)
-def test_matches_reference_hash_file_hdf5(
-    mock_nc4_matches_reference_hash_file,
-    mock_h5_matches_reference_hash_file,
-    mock_geotiff_matches_reference_hash_file,
-):
-    """Ensure an HDF-5 input is routed to the correct comparison function."""
-    mock_h5_matches_reference_hash_file.return_value = True
-
-    metadata_to_skip = {'varying_parameter'}
-
-    assert matches_reference_hash_file(
-        'input.h5',
-        'hashes.json',
-        skipped_metadata_attributes=metadata_to_skip,
-    )
-    mock_h5_matches_reference_hash_file.assert_called_once_with(
-        'input.h5',
-        'hashes.json',
-        skipped_metadata_attributes=metadata_to_skip,
-    )
-
-    # Ensure other comparison functions weren't called
-    mock_nc4_matches_reference_hash_file.assert_not_called()
-    mock_geotiff_matches_reference_hash_file.assert_not_called()
-
-
-@patch('earthdata_hashdiff.compare.geotiff_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.h5_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.nc4_matches_reference_hash_file', autospec=True)
-def test_matches_reference_hash_file_geotiff(
-    mock_nc4_matches_reference_hash_file,
-    mock_h5_matches_reference_hash_file,
-    mock_geotiff_matches_reference_hash_file,
+@pytest.mark.parametrize(
+    'file_path,expected_comparison,comparison_kwargs',
+    [
+        ('input.nc4', 'nc4_matches_reference_hash_file', {}),
+        (
+            'input.nc4',
+            'nc4_matches_reference_hash_file',
+            {'skipped_variables_or_groups': {'variable_one', 'variable_two'}},
+        ),
+        (
+            'input.h5',
+            'h5_matches_reference_hash_file',
+            {'skipped_metadata_attributes': {'varying_parameter'}},
+        ),
+        ('input.tiff', 'geotiff_matches_reference_hash_file', {}),
+    ],
+    ids=['netcdf4', 'netcdf4_kwargs', 'hdf5', 'geotiff'],
+)
+def test_matches_reference_hash_file_routing(
+    file_path, expected_comparison, comparison_kwargs
 ):
-    """Ensure a GeoTIFF input is routed to the correct comparison function."""
-    mock_geotiff_matches_reference_hash_file.return_value = True
-
-    assert matches_reference_hash_file('input.tiff', 'hashes.json')
-
-    mock_geotiff_matches_reference_hash_file.assert_called_once_with(
-        'input.tiff',
-        'hashes.json',
-    )
+    """Ensure input is routed to the correct comparison function, with kwargs."""
+    with patch.multiple(
+        'earthdata_hashdiff.compare',
+        geotiff_matches_reference_hash_file=DEFAULT,
+        h5_matches_reference_hash_file=DEFAULT,
+        nc4_matches_reference_hash_file=DEFAULT,
+    ) as mock_comparisons:
+        mock_comparisons[expected_comparison].return_value = True
+
+        assert matches_reference_hash_file(
+            file_path,
+            'hashes.json',
+            **comparison_kwargs,
+        )
+        mock_comparisons[expected_comparison].assert_called_once_with(
+            file_path,
+            'hashes.json',
+            **comparison_kwargs,
+        )
 
-    # Ensure other comparison functions weren't called
-    mock_nc4_matches_reference_hash_file.assert_not_called()
-    mock_h5_matches_reference_hash_file.assert_not_called()
+        # Ensure other comparison functions weren't called
+        for comparison_name, mock_comparison in mock_comparisons.items():
+            if comparison_name != expected_comparison:
+                mock_comparison.assert_not_called()
 
 
 def test_matches_reference_hash_file_unknown_kwargs():
@@ -310,19 +239,17 @@ def test_matches_reference_hash_file_wrong_kwargs():
         )
 
 
-@patch('earthdata_hashdiff.compare.geotiff_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.h5_matches_reference_hash_file', autospec=True)
-@patch('earthdata_hashdiff.compare.nc4_matches_reference_hash_file', autospec=True)
-def test_matches_reference_hash_file_unknown_file_extension(
-    mock_nc4_matches_reference_hash_file,
-    mock_h5_matches_reference_hash_file,
-    mock_geotiff_matches_reference_hash_file,
-):
+def test_matches_reference_hash_file_unknown_file_extension():
     """Ensure that a file with an unknown extension raises a ValueError."""
-    with pytest.raises(ValueError, match=r'File extension not recognised: ".xyz"'):
-        matches_reference_hash_file('input.xyz', 'hashes.json')
-
-    # Ensure other comparison functions weren't called
-    mock_nc4_matches_reference_hash_file.assert_not_called()
-    mock_h5_matches_reference_hash_file.assert_not_called()
-    mock_geotiff_matches_reference_hash_file.assert_not_called()
+    with patch.multiple(
+        'earthdata_hashdiff.compare',
+        geotiff_matches_reference_hash_file=DEFAULT,
+        h5_matches_reference_hash_file=DEFAULT,
+        nc4_matches_reference_hash_file=DEFAULT,
+    ) as mock_comparisons:
+        with pytest.raises(ValueError, match=r'File extension not recognised: ".xyz"'):
+            matches_reference_hash_file('input.xyz', 'hashes.json')
+
+        # Ensure other comparison functions weren't called
+        for mock_comparison in mock_comparisons.values():
+            mock_comparison.assert_not_called()
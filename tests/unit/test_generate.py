@@ -1,16 +1,14 @@
 """Unit tests for the earthdata_hashdiff.generate.py module."""
 
-import json
 from datetime import datetime
-from os.path import join as path_join
+from pathlib import Path
 
 import numpy as np
+import orjson
 import pytest
 
 from earthdata_hashdiff.generate import (
     create_geotiff_hash_file,
-    create_h5_hash_file,
-    create_nc4_hash_file,
     create_xarray_reference_file,
     get_full_variable_path,
     get_group_dimensions_bytes,
@@ -35,36 +33,11 @@ def test_create_xarray_reference_file(tmpdir, sample_nc4_file, sample_datatree_h
     dumps a dictionary out to a JSON file.
 
     """
-    reference_file_path = path_join(tmpdir, 'sample_output.json')
+    reference_file_path = f'{tmpdir}/sample_output.json'
     create_xarray_reference_file(sample_nc4_file, reference_file_path, {})
 
     # Ensure output hash file exists and matches test fixtures:
-    with open(reference_file_path, encoding='utf-8') as file_handler:
-        reference_file_json = json.load(file_handler)
-
-    assert reference_file_json == sample_datatree_hashes
-
-
-def test_create_h5_hash_file(tmpdir, sample_h5_file, sample_datatree_hashes):
-    """Test HDF-5 alias for creating hash files using xarray."""
-    reference_file_path = path_join(tmpdir, 'sample_output.json')
-    create_h5_hash_file(sample_h5_file, reference_file_path, {})
-
-    # Ensure output hash file exists and matches test fixtures:
-    with open(reference_file_path, encoding='utf-8') as file_handler:
-        reference_file_json = json.load(file_handler)
-
-    assert reference_file_json == sample_datatree_hashes
-
-
-def test_create_nc4_hash_file(tmpdir, sample_nc4_file, sample_datatree_hashes):
-    """Test netCDF4 alias for creating hash files using xarray."""
-    reference_file_path = path_join(tmpdir, 'sample_output.json')
-    create_nc4_hash_file(sample_nc4_file, reference_file_path, {})
-
-    # Ensure output hash file exists and matches test fixtures:
-    with open(reference_file_path, encoding='utf-8') as file_handler:
-        reference_file_json = json.load(file_handler)
+    reference_file_json = orjson.loads(Path(reference_file_path).read_bytes())
 
     assert reference_file_json == sample_datatree_hashes
 
@@ -246,49 +219,50 @@ def test_get_numpy_array_bytes(numpy_array, expected_bytes):
     assert get_numpy_array_bytes(numpy_array) == expected_bytes
 
 
-def test_get_metadata_bytes(latitude_metadata, latitude_metadata_bytes):
-    """Ensure dictionary of metadata attributes gives expected bytes out."""
-    assert get_metadata_bytes(latitude_metadata, set()) == latitude_metadata_bytes
-
-
-def test_get_metadata_bytes_history(latitude_metadata, latitude_metadata_bytes):
-    """Ensure history metadata attribute is ignored in output metadata bytes."""
-    latitude_metadata['history'] = datetime.now().isoformat()
-    assert get_metadata_bytes(latitude_metadata, set()) == latitude_metadata_bytes
+@pytest.mark.parametrize(
+    'extra_metadata,skipped_metadata_attributes',
+    [
+        ({}, set()),
+        ({'history': datetime.now().isoformat()}, set()),
+        ({'to_skip': 'some value'}, {'to_skip'}),
+    ],
+    ids=['no_extra_metadata', 'history', 'skipped'],
+)
+def test_get_metadata_bytes(
+    extra_metadata,
+    skipped_metadata_attributes,
+    latitude_metadata,
+    latitude_metadata_bytes,
+):
+    """Ensure dictionary of metadata attributes gives expected bytes out.
 
+    The history metadata attribute, and any skipped attributes, should be
+    ignored in the output metadata bytes.
 
-def test_get_metadata_bytes_skipped(latitude_metadata, latitude_metadata_bytes):
-    """Ensure skipped attributes are skipped when deriving metadata bytes."""
-    latitude_metadata['to_skip'] = 'some value'
+    """
     assert (
         get_metadata_bytes(
-            latitude_metadata,
-            {
-                'to_skip',
-            },
+            {**latitude_metadata, **extra_metadata},
+            skipped_metadata_attributes,
         )
         == latitude_metadata_bytes
     )
 
 
 @pytest.mark.parametrize(
-    'attribute_name',
+    'attribute_name,expected_varying',
     [
-        'history',
-        'History',
-        'HISTORY',
-        'history_json',
-        'HISTORY_JSON',
+        ('history', True),
+        ('History', True),
+        ('HISTORY', True),
+        ('history_json', True),
+        ('HISTORY_JSON', True),
+        ('non_varying_attribute', False),
     ],
 )
-def test_is_varying_attribute_varying(attribute_name):
-    """Ensure varying attributes are correctly identified."""
-    assert is_varying_attribute(attribute_name)
-
-
-def test_is_varying_attribute_not_varying():
-    """Ensure a non-varying attribute is not incorrectly flagged."""
-    assert not is_varying_attribute('non_varying_attribute')
+def test_is_varying_attribute(attribute_name, expected_varying):
+    """Ensure varying attributes, and only those, are correctly identified."""
+    assert is_varying_attribute(attribute_name) == expected_varying
 
 
 @pytest.mark.parametrize(
@@ -317,12 +291,11 @@ def test_create_geotiff_hash_file(sample_geotiff_file, tmpdir, sample_geotiff_ha
     dumps a dictionary out to a JSON file.
 
     """
-    reference_file_path = path_join(tmpdir, 'sample_output.json')
+    reference_file_path = f'{tmpdir}/sample_output.json'
     create_geotiff_hash_file(sample_geotiff_file, reference_file_path, {})
 
     # Ensure output hash file exists and matches test fixtures:
-    with open(reference_file_path, encoding='utf-8') as file_handler:
-        reference_file_json = json.load(file_handler)
+    reference_file_json = orjson.loads(Path(reference_file_path).read_bytes())
 
     assert reference_file_json == sample_geotiff_hash
 
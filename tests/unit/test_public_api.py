@@ -1,18 +1,22 @@
 """Unit tests for the earthdata_hashdiff public API.
 
-These tests duplicate unit tests for the individual modules that the functions
-are derived from, but demonstrate the imports and re-exports work as
-anticipated.
+Most of these tests duplicate unit tests for the individual modules that the
+functions are derived from, but demonstrate the imports and re-exports work as
+anticipated. The exception is the HDF-5 and netCDF4 aliases for creating hash
+files, which are only tested in this module.
 
 """
 
-import json
-from os.path import join as path_join
+from pathlib import Path
+
+import orjson
+import pytest
 
 from earthdata_hashdiff import (
     create_geotiff_hash_file,
     create_h5_hash_file,
     create_nc4_hash_file,
+    generate,
     geotiff_matches_reference_hash_file,
     get_hash_from_geotiff_file,
     get_hashes_from_h5_file,
@@ -24,36 +28,47 @@ from earthdata_hashdiff import (
 
 def test_create_geotiff_hash_file(tmpdir, sample_geotiff_file, sample_geotiff_hash):
     """Test GeoTIFF public function for creating hash file."""
-    reference_file_path = path_join(tmpdir, 'sample_output.json')
+    reference_file_path = f'{tmpdir}/sample_output.json'
     create_geotiff_hash_file(sample_geotiff_file, reference_file_path)
 
     # Ensure output hash file exists and matches test fixtures:
-    with open(reference_file_path, encoding='utf-8') as file_handler:
-        reference_file_json = json.load(file_handler)
+    reference_file_json = orjson.loads(Path(reference_file_path).read_bytes())
 
     assert reference_file_json == sample_geotiff_hash
 
 
-def test_create_h5_hash_file(tmpdir, sample_h5_file, sample_datatree_hashes):
-    """Test HDF-5 alias for creating hash files using xarray."""
-    reference_file_path = path_join(tmpdir, 'sample_output.json')
-    create_h5_hash_file(sample_h5_file, reference_file_path, {})
-
-    # Ensure output hash file exists and matches test fixtures:
-    with open(reference_file_path, encoding='utf-8') as file_handler:
-        reference_file_json = json.load(file_handler)
+@pytest.mark.parametrize(
+    'public_function,module_function,sample_file_fixture',
+    [
+        (create_h5_hash_file, generate.create_h5_hash_file, 'sample_h5_file'),
+        (create_nc4_hash_file, generate.create_nc4_hash_file, 'sample_nc4_file'),
+    ],
+    ids=['h5', 'nc4'],
+)
+def test_create_xarray_alias_hash_file(
+    public_function,
+    module_function,
+    sample_file_fixture,
+    sample_datatree_hashes,
+    tmpdir,
+    request,
+):
+    """Test HDF-5 and netCDF4 aliases for creating hash files using xarray.
 
-    assert reference_file_json == sample_datatree_hashes
+    The public API re-exports the aliases from `earthdata_hashdiff.generate`,
+    so the same function objects cover both modules, and these are not
+    separately tested in `test_generate.py`.
 
+    """
+    assert public_function is module_function
 
-def test_create_nc4_hash_file(tmpdir, sample_nc4_file, sample_datatree_hashes):
-    """Test netCDF4 alias for creating hash files using xarray."""
-    reference_file_path = path_join(tmpdir, 'sample_output.json')
-    create_nc4_hash_file(sample_nc4_file, reference_file_path, {})
+    reference_file_path = f'{tmpdir}/sample_output.json'
+    public_function(
+        request.getfixturevalue(sample_file_fixture), reference_file_path, {}
+    )
 
     # Ensure output hash file exists and matches test fixtures:
-    with open(reference_file_path, encoding='utf-8') as file_handler:
-        reference_file_json = json.load(file_handler)
+    reference_file_json = orjson.loads(Path(reference_file_path).read_bytes())
 
     assert reference_file_json == sample_datatree_hashes
 